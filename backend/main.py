@@ -6,12 +6,21 @@ Read-only: only 'show' commands are ever sent to switches
 
 from fastapi import FastAPI, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from typing import Optional
 import asyncio
 import json
+import multiprocessing
+import orjson
+import os
 import re
+import tempfile
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 from pathlib import Path
 
@@ -23,7 +32,8 @@ except ImportError:
     NETMIKO_AVAILABLE = False
     print("⚠  netmiko not installed — running in DEMO mode (pip install netmiko)")
 
-app = FastAPI(title="Cisco 9300 Live Monitor", version="2.0.0")
+# orjson encodes the large per-port payloads several times faster than stdlib json
+app = FastAPI(title="Cisco 9300 Live Monitor", version="2.0.0", default_response_class=ORJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -45,16 +55,49 @@ DEFAULT_SWITCHES = [
     {"name": "SW-DIST-01",    "host": "192.168.1.10", "location": "Comms Room B",  "model": "C9300-48P"},
 ]
 
+def write_atomic(path: Path, data: bytes):
+    """Write data to path via a uniquely named temp file + rename, so readers
+    never see a half-written file and concurrent writers cannot collide."""
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=f".{path.name}.", delete=False) as tmp:
+        tmp.write(data)
+    try:
+        # NamedTemporaryFile creates 0600 — keep the mode of the file we replace
+        if path.exists():
+            os.chmod(tmp.name, path.stat().st_mode & 0o7777)
+        os.replace(tmp.name, path)
+    except OSError:
+        os.unlink(tmp.name)
+        raise
+
+# Parsed inventory, re-read only when switches.json's mtime changes
+_inv_cache = {"mtime": 0.0, "data": None}
+_inv_hosts: frozenset = frozenset()   # host index of the cached inventory
+
 def load_switches():
-    if SWITCHES_FILE.exists():
-        return json.loads(SWITCHES_FILE.read_text())
-    # Write defaults on first run
-    SWITCHES_FILE.write_text(json.dumps(DEFAULT_SWITCHES, indent=2))
-    return DEFAULT_SWITCHES
+    global _inv_hosts
+    try:
+        mtime = SWITCHES_FILE.stat().st_mtime
+    except FileNotFoundError:
+        # Write defaults on first run
+        SWITCHES_FILE.write_text(json.dumps(DEFAULT_SWITCHES, indent=2))
+        mtime = SWITCHES_FILE.stat().st_mtime
+    if _inv_cache["data"] is None or mtime != _inv_cache["mtime"]:
+        data = json.loads(SWITCHES_FILE.read_text())
+        _inv_cache.update(mtime=mtime, data=data)
+        _inv_hosts = frozenset(sw["host"] for sw in data)
+        # Grow the cache with the inventory so one poll round never evicts
+        # hosts polled earlier in the same round
+        _cache.maxsize = max(CACHE_MAXSIZE, CACHE_KEYS_PER_HOST * len(_inv_hosts))
+    return _inv_cache["data"]
+
+def require_known_host(host: str):
+    """404 unless host is in the inventory (security: don't allow arbitrary hosts)."""
+    load_switches()
+    if host not in _inv_hosts:
+        raise HTTPException(404, f"Switch {host} not in inventory")
 
 # ── SSH credentials ────────────────────────────────────────────────────────────
 # Set via environment variables or edit directly here
-import os
 SSH_USERNAME = os.getenv("SWITCH_USER", "readonly")
 SSH_PASSWORD = os.getenv("SWITCH_PASS", "your_password_here")
 SSH_SECRET   = os.getenv("SWITCH_SECRET", "")   # enable secret if needed
@@ -62,18 +105,107 @@ SSH_PORT     = int(os.getenv("SWITCH_PORT", "22"))
 SSH_TIMEOUT  = int(os.getenv("SWITCH_TIMEOUT", "15"))
 
 # ── In-memory cache (avoid hammering switches on every request) ───────────────
-_cache: dict = {}
-CACHE_TTL = 60  # seconds
-
-def cache_get(key: str):
-    if key in _cache:
-        data, ts = _cache[key]
-        if time.time() - ts < CACHE_TTL:
-            return data
-    return None
+CACHE_TTL     = 60                # seconds
+CACHE_MAXSIZE = 4096              # entries (floor) — least recently used are evicted beyond this
+CACHE_KEYS_PER_HOST = 4           # headroom per switch: a poll writes ports: + status:
+CACHE_MAX_AGE = CACHE_TTL * 10    # entries older than this are swept out entirely
+
+class LRUCache:
+    """Size-bounded, thread-safe LRU map of key → (data, timestamp).
+    Entries older than max_age are dropped by a sweep that runs at most once
+    per sweep_every seconds, piggybacked on normal reads and writes."""
+
+    def __init__(self, maxsize: int, max_age: float, sweep_every: float):
+        self.maxsize     = maxsize
+        self.max_age     = max_age
+        self.sweep_every = sweep_every
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._last_sweep = time.time()
+
+    def _maybe_sweep(self, now: float):
+        # Caller holds self._lock
+        if now - self._last_sweep < self.sweep_every:
+            return
+        self._last_sweep = now
+        for key in [k for k, (_, ts) in self._data.items() if now - ts > self.max_age]:
+            del self._data[key]
+
+    def peek(self, key: str):
+        """Return (data, ts) for key regardless of age (up to max_age), or None."""
+        with self._lock:
+            self._maybe_sweep(time.time())
+            entry = self._data.get(key)
+            if entry is not None:
+                self._data.move_to_end(key)
+            return entry
+
+    def set(self, key: str, data):
+        with self._lock:
+            now = time.time()
+            self._maybe_sweep(now)
+            self._data[key] = (data, now)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: str, default=None):
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def items(self) -> list:
+        """Snapshot of (key, (data, ts)) pairs, least recently used first."""
+        with self._lock:
+            return list(self._data.items())
+
+    def restore(self, key: str, data, ts: float):
+        """Insert an entry with its original timestamp (used when loading from disk)."""
+        with self._lock:
+            self._data[key] = (data, ts)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __len__(self):
+        return len(self._data)
+
+_cache = LRUCache(CACHE_MAXSIZE, max_age=CACHE_MAX_AGE, sweep_every=CACHE_TTL)
+
+# ── Disk snapshot — a restart resumes from the last polled state ──────────────
+CACHE_FILE           = Path(__file__).parent / "cache.json"
+CACHE_SNAPSHOT_EVERY = 300  # seconds
+
+def save_cache_snapshot():
+    """Write the cache to CACHE_FILE atomically (safe against concurrent saves)."""
+    write_atomic(CACHE_FILE, orjson.dumps({k: [data, ts] for k, (data, ts) in _cache.items()}))
+
+def load_cache_snapshot() -> set:
+    """Restore entries younger than CACHE_TTL from CACHE_FILE.
+    Returns the hosts whose port data was restored. A missing, corrupt or
+    wrongly shaped file is ignored — it must never stop the app starting."""
+    try:
+        entries = [
+            (key, data, float(ts))
+            for key, (data, ts) in orjson.loads(CACHE_FILE.read_bytes()).items()
+        ]
+        if not all(isinstance(data, dict) for _, data, _ in entries):
+            raise ValueError("cache entry is not an object")
+    except FileNotFoundError:
+        return set()
+    except Exception as e:
+        print(f"⚠  ignoring unreadable cache snapshot: {e!r}")
+        return set()
+    now   = time.time()
+    hosts = set()
+    for key, data, ts in entries:
+        if not 0 <= now - ts <= CACHE_TTL:   # expired, or stamped in the future
+            continue
+        _cache.restore(key, data, ts)
+        if key.startswith("ports:"):
+            hosts.add(key.split(":", 1)[1])
+    return hosts
 
 def cache_set(key: str, data):
-    _cache[key] = (data, time.time())
+    _cache.set(key, data)
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # NETMIKO SSH  ─ read-only show commands only
@@ -94,31 +226,137 @@ def ssh_connect(host: str):
     }
     return ConnectHandler(**device)
 
+# ── Persistent sessions (one long-lived connection per switch) ────────────────
+# Re-using the session skips the 1–3 s TCP/SSH handshake on every poll.
+# A Netmiko connection is not thread-safe, so each host has its own lock that
+# must be held for the whole time a connection is in use.
+_conn_cache: dict = {}
+_conn_locks: dict = {}
+_conn_locks_guard = threading.Lock()
+
+def host_lock(host: str) -> threading.Lock:
+    """Return the lock serialising SSH use of one host."""
+    with _conn_locks_guard:
+        return _conn_locks.setdefault(host, threading.Lock())
+
+def get_conn(host: str):
+    """Return a healthy cached connection to host, reconnecting if needed.
+    Caller must hold host_lock(host)."""
+    conn = _conn_cache.get(host)
+    if conn is not None:
+        try:
+            if conn.is_alive():
+                return conn
+        except Exception:
+            pass
+        drop_conn(host)
+    conn = ssh_connect(host)
+    _conn_cache[host] = conn
+    return conn
+
+def drop_conn(host: str):
+    """Forget and close the cached connection to host (if any)."""
+    conn = _conn_cache.pop(host, None)
+    if conn is not None:
+        try:
+            conn.disconnect()
+        except Exception:
+            pass
+
+def find_hostname(host: str) -> str:
+    """Open a fresh SSH connection, read the hostname from the prompt, close.
+    Deliberately bypasses the persistent session: it tests a new login and
+    does not queue behind a poll holding host_lock."""
+    with ssh_connect(host) as conn:
+        return conn.find_prompt().replace("#", "").replace(">", "").strip()
+
+# Only commands starting with one of these are ever sent to a switch
+_ALLOWED_PREFIXES = ("show", "terminal", "sh ")
+
 def run_show(host: str, command: str) -> str:
     """Execute a single show command and return output."""
-    # Safety guard — never allow config commands
-    cmd = command.strip().lower()
-    if not cmd.startswith("show") and not cmd.startswith("terminal") and not cmd.startswith("sh "):
-        raise ValueError(f"Only 'show' commands allowed, got: {command}")
-    with ssh_connect(host) as conn:
-        return conn.send_command(command, read_timeout=30)
+    return run_show_multi(host, [command])[command]
 
 def run_show_multi(host: str, commands: list[str]) -> dict[str, str]:
-    """Run multiple show commands in a single SSH session."""
+    """Run multiple show commands over the host's persistent SSH session."""
+    # Safety guard — never allow config commands
     for cmd in commands:
-        c = cmd.strip().lower()
-        if not c.startswith("show") and not c.startswith("terminal") and not c.startswith("sh "):
+        if not cmd.strip().lower().startswith(_ALLOWED_PREFIXES):
             raise ValueError(f"Only 'show' commands allowed, got: {cmd}")
     results = {}
-    with ssh_connect(host) as conn:
-        for cmd in commands:
-            results[cmd] = conn.send_command(cmd, read_timeout=30)
+    with host_lock(host):
+        conn = get_conn(host)
+        try:
+            for cmd in commands:
+                results[cmd] = conn.send_command(cmd, read_timeout=30)
+        except Exception:
+            # Session may be half-dead — start fresh on the next poll
+            drop_conn(host)
+            raise
     return results
 
+# ── Blocking SSH work runs here, never on the event loop ─────────────────────
+_SSH_POOL = ThreadPoolExecutor(max_workers=32, thread_name_prefix="ssh")
+
+async def in_ssh_pool(fn, *args):
+    """Run a blocking SSH call in _SSH_POOL and await its result."""
+    return await asyncio.get_running_loop().run_in_executor(_SSH_POOL, fn, *args)
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # PARSERS  ─ extract structured data from Cisco CLI output
 # ═══════════════════════════════════════════════════════════════════════════════
 
+# ── Compiled patterns (built once at import, reused on every poll) ────────────
+# Status and PoE patterns run over the whole buffer with finditer() rather than
+# per line; [ \t] is used instead of \s so a match cannot spill onto the next line.
+_RE_IFSTATUS = re.compile(
+    r'^(Gi\S+|Te\S+|Fa\S+)[ \t]+'     # interface
+    r'(\S.*?)?[ \t]{2,}'              # name (optional)
+    r'(\S+)[ \t]+'                    # status
+    r'(\S+)[ \t]+'                    # vlan
+    r'(\S+)[ \t]+'                    # duplex
+    r'(\S+)[ \t]+'                    # speed
+    r'(.+)?$',                        # type
+    re.MULTILINE,
+)
+_RE_IFHDR        = re.compile(r'^(Gi\S+|Te\S+|Fa\S+) is (\S+)')
+# Counter lines of 'show interfaces' — one alternation, dispatched on lastgroup.
+# finditer() is used per line because IOS prints several counters on one line
+# ("0 input errors, 0 CRC, 0 frame, ..."). re backtracks rather than running a
+# DFA, so the branches are gated on the start of a number: every other offset
+# is rejected after one lookaround instead of six failed branches.
+_RE_DETAIL = re.compile(
+    r'(?<!\d)(?=\d)(?:'
+    r'\d+ packets input.*?(?P<rx_bytes>\d+) bytes'
+    r'|\d+ packets output.*?(?P<tx_bytes>\d+) bytes'
+    r'|(?P<rates>(?P<rx_kbit>\d+) Kbit/sec.*?(?P<tx_kbit>\d+) Kbit/sec)'
+    r'|(?P<rx_errors>\d+) input errors'
+    r'|(?P<tx_errors>\d+) output errors'
+    r'|(?P<crc>\d+) CRC'
+    r')'
+)
+_RE_POE          = re.compile(r'^(Gi\S+|Te\S+)[ \t]+\S+[ \t]+(\S+)[ \t]+([\d.]+)', re.MULTILINE)
+_RE_MAC          = re.compile(
+    r'^[ \t]*(\d+)[ \t]+([0-9a-f]{4})\.([0-9a-f]{4})\.([0-9a-f]{4})[ \t]+(\S+)[ \t]+(\S+)',
+    re.IGNORECASE | re.MULTILINE,
+)
+_RE_UPTIME_PART  = re.compile(r'(\d+)\s*(year|week|day|hour|minute)')
+_RE_HOSTNAME     = re.compile(r'^hostname\s+(\S+)', re.MULTILINE)
+
+# Raw 'show interfaces status' tokens → normalised values
+_SPEED_MAP = {
+    "a-10":   "10",    "10":    "10",
+    "a-100":  "100",   "100":   "100",
+    "a-1000": "1000",  "1000":  "1000",
+    "a-10G":  "10000", "10G":   "10000", "10000": "10000",
+    "auto":   "auto",
+}
+_STATUS_MAP = {
+    "connected":    "up",
+    "disabled":     "disabled",
+    "err-disabled": "disabled",
+}
+
 def parse_interfaces_status(raw: str) -> list[dict]:
     """
     Parse: show interfaces status
@@ -127,46 +365,18 @@ def parse_interfaces_status(raw: str) -> list[dict]:
     Gi1/0/2                      notconnect   1          auto    auto  10/100/1000BaseTX
     """
     ports = []
-    for line in raw.splitlines():
-        m = re.match(
-            r'^(Gi\S+|Te\S+|Fa\S+)\s+'       # interface
-            r'(\S.*?)?\s{2,}'                  # name (optional)
-            r'(\S+)\s+'                        # status
-            r'(\S+)\s+'                        # vlan
-            r'(\S+)\s+'                        # duplex
-            r'(\S+)\s+'                        # speed
-            r'(.+)?$',                         # type
-            line
-        )
-        if m:
-            iface, name, status, vlan, duplex, speed, itype = m.groups()
-            # Normalise
-            if status == "connected":
-                st = "up"
-            elif status in ("disabled", "err-disabled"):
-                st = "disabled"
-            else:
-                st = "down"
-
-            # Speed cleanup
-            spd = speed.replace("a-", "").replace("G", "000").upper()
-            if "1000" in spd or "1G" in spd.upper():
-                spd = "1000"
-            elif "100" in spd:
-                spd = "100"
-            elif "10G" in spd.upper() or "10000" in spd:
-                spd = "10000"
-            else:
-                spd = speed.replace("a-", "")
-
-            ports.append({
-                "id":          iface,
-                "description": (name or "").strip(),
-                "status":      st,
-                "vlan":        vlan if vlan.isdigit() else 1,
-                "duplex":      duplex,
-                "speed":       spd,
-            })
+    for m in _RE_IFSTATUS.finditer(raw):
+        # Indexed access — m.groups() would build a 7-tuple per port
+        vlan  = m[4]
+        speed = m[6]
+        ports.append({
+            "id":          m[1],
+            "description": (m[2] or "").strip(),
+            "status":      _STATUS_MAP.get(m[3], "down"),
+            "vlan":        vlan if vlan.isdigit() else 1,
+            "duplex":      m[5],
+            "speed":       _SPEED_MAP.get(speed) or speed.replace("a-", ""),
+        })
     return ports
 
 def parse_interfaces_detail(raw: str) -> dict:
@@ -178,11 +388,10 @@ def parse_interfaces_detail(raw: str) -> dict:
     current = None
     for line in raw.splitlines():
         # Interface header line
-        m = re.match(r'^(Gi\S+|Te\S+|Fa\S+) is (\S+)', line)
+        m = _RE_IFHDR.match(line)
         if m:
-            current = m.group(1)
-            result[current] = {
-                "admin_status": "up" if "up" in m.group(2) else "down",
+            current = result[m[1]] = {
+                "admin_status": "up" if "up" in m[2] else "down",
                 "rx_errors": 0, "tx_errors": 0, "crc": 0,
                 "rx_bytes": 0, "tx_bytes": 0,
                 "rx_rate": 0, "tx_rate": 0,
@@ -191,33 +400,13 @@ def parse_interfaces_detail(raw: str) -> dict:
         if current is None:
             continue
 
-        # Input/output rates
-        m = re.search(r'(\d+) packets input.*?(\d+) bytes', line)
-        if m:
-            result[current]["rx_bytes"] = int(m.group(2))
-
-        m = re.search(r'(\d+) packets output.*?(\d+) bytes', line)
-        if m:
-            result[current]["tx_bytes"] = int(m.group(2))
-
-        # Bit rates
-        m = re.search(r'(\d+) Kbit/sec.*?(\d+) Kbit/sec', line)
-        if m:
-            result[current]["rx_rate"] = int(int(m.group(1)) / 1000)
-            result[current]["tx_rate"] = int(int(m.group(2)) / 1000)
-
-        # Error counters
-        m = re.search(r'(\d+) input errors', line)
-        if m:
-            result[current]["rx_errors"] = int(m.group(1))
-
-        m = re.search(r'(\d+) output errors', line)
-        if m:
-            result[current]["tx_errors"] = int(m.group(1))
-
-        m = re.search(r'(\d+) CRC', line)
-        if m:
-            result[current]["crc"] = int(m.group(1))
+        for m in _RE_DETAIL.finditer(line):
+            field = m.lastgroup
+            if field == "rates":
+                current["rx_rate"] = int(int(m["rx_kbit"]) / 1000)
+                current["tx_rate"] = int(int(m["tx_kbit"]) / 1000)
+            else:
+                current[field] = int(m[field])
 
     return result
 
@@ -228,14 +417,12 @@ def parse_poe_status(raw: str) -> dict:
     Gi1/0/1    auto   on         7.4     Cisco IP Phone      3      30.0
     """
     result = {}
-    for line in raw.splitlines():
-        m = re.match(r'^(Gi\S+|Te\S+)\s+\S+\s+(\S+)\s+([\d.]+)', line)
-        if m:
-            iface, oper, watts = m.groups()
-            result[iface] = {
-                "poe": oper.lower() == "on",
-                "poeWatts": float(watts) if oper.lower() == "on" else 0.0,
-            }
+    for m in _RE_POE.finditer(raw):
+        on = m[2].lower() == "on"
+        result[m[1]] = {
+            "poe": on,
+            "poeWatts": float(m[3]) if on else 0.0,
+        }
     return result
 
 def parse_mac_table(raw: str, iface: str) -> list[dict]:
@@ -245,52 +432,53 @@ def parse_mac_table(raw: str, iface: str) -> list[dict]:
       10    aabb.cc11.2233    DYNAMIC     Gi1/0/1
     """
     entries = []
-    for line in raw.splitlines():
-        m = re.match(r'\s*(\d+)\s+([0-9a-f.]+)\s+(\S+)\s+(\S+)', line, re.IGNORECASE)
-        if m:
-            vlan, mac, mtype, port = m.groups()
-            entries.append({
-                "mac":  mac.replace(".", ":"),   # normalise format
-                "vlan": int(vlan),
-                "type": mtype.lower(),
-            })
+    for m in _RE_MAC.finditer(raw):
+        a, b, c = m[2], m[3], m[4]
+        entries.append({
+            # aabb.cc11.2233 → aa:bb:cc:11:22:33
+            "mac":  f"{a[:2]}:{a[2:]}:{b[:2]}:{b[2:]}:{c[:2]}:{c[2:]}",
+            "vlan": int(m[1]),
+            "type": m[5].lower(),
+        })
     return entries
 
+_UPTIME_MULT = {"year": 365 * 86400, "week": 7 * 86400, "day": 86400, "hour": 3600, "minute": 60}
+
 def parse_uptime(raw: str) -> int:
     """Parse uptime from 'show version' → seconds"""
-    m = re.search(r'uptime is (.+)', raw, re.IGNORECASE)
-    if not m:
+    start = raw.find("uptime is ")
+    if start < 0:
         return 0
-    uptime_str = m.group(1)
-    seconds = 0
-    for val, unit in re.findall(r'(\d+)\s*(year|week|day|hour|minute)', uptime_str):
-        val = int(val)
-        if "year"   in unit: seconds += val * 365 * 86400
-        elif "week" in unit: seconds += val * 7 * 86400
-        elif "day"  in unit: seconds += val * 86400
-        elif "hour" in unit: seconds += val * 3600
-        elif "min"  in unit: seconds += val * 60
-    return seconds
+    end = raw.find("\n", start)
+    line = raw[start:end] if end >= 0 else raw[start:]
+    return sum(int(val) * _UPTIME_MULT[unit] for val, unit in _RE_UPTIME_PART.findall(line))
 
 def parse_hostname(raw: str) -> str:
-    m = re.search(r'^hostname\s+(\S+)', raw, re.MULTILINE)
-    return m.group(1) if m else "unknown"
+    m = _RE_HOSTNAME.search(raw)
+    return m[1] if m else "unknown"
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # ASSEMBLER  ─ combine all show output into unified port list
 # ═══════════════════════════════════════════════════════════════════════════════
 
-def assemble_ports(outputs: dict) -> list[dict]:
-    """Merge all parsed show outputs into a unified port list for the frontend."""
+def assemble_ports(outputs: dict) -> tuple[list[dict], int]:
+    """Merge all parsed show outputs into a unified port list for the frontend.
+    Returns (ports, number of ports that are up)."""
     status_list  = parse_interfaces_status(outputs.get("show interfaces status", ""))
     detail_map   = parse_interfaces_detail(outputs.get("show interfaces", ""))
     poe_map      = parse_poe_status(outputs.get("show power inline", ""))
 
-    ports = []
+    # One "now" for the whole poll — every port shares the same timestamp
+    now_iso = datetime.utcnow().isoformat()
+    now_ms  = int(time.time() * 1000)
+
+    ports    = []
+    up_count = 0
     for i, p in enumerate(status_list):
-        iface = p["id"]
-        det   = detail_map.get(iface, {})
-        poe   = poe_map.get(iface, {"poe": False, "poeWatts": 0.0})
+        iface    = p["id"]
+        det      = detail_map.get(iface, {})
+        poe      = poe_map.get(iface, {"poe": False, "poeWatts": 0.0})
+        vlan_str = str(p["vlan"])
 
         # MAC table was fetched per-switch, not per-port (too slow)
         # Frontend can request per-port MAC on demand
@@ -300,9 +488,9 @@ def assemble_ports(outputs: dict) -> list[dict]:
             "portNum":     i + 1,
             "status":      p["status"],
             "description": p["description"],
-            "vlan":        int(p["vlan"]) if str(p["vlan"]).isdigit() else 1,
+            "vlan":        int(vlan_str) if vlan_str.isdigit() else 1,
             "speed":       p["speed"],
-            "mode":        "trunk" if str(p["vlan"]).lower() in ("trunk", "routed") else "access",
+            "mode":        "trunk" if vlan_str.lower() in ("trunk", "routed") else "access",
             "poe":         poe["poe"],
             "poeWatts":    poe["poeWatts"],
             "uptime":      0,    # not available from status cmd; use lastChanged
@@ -316,14 +504,190 @@ def assemble_ports(outputs: dict) -> list[dict]:
             "rxRate":      det.get("rx_rate", 0),
             "txRate":      det.get("tx_rate", 0),
             "macTable":    [],
-            "lastChanged": datetime.utcnow().isoformat(),
-            "lastSeen":    datetime.utcnow().isoformat() if p["status"] == "up" else None,
+            "lastChanged": now_iso,
+            "lastSeen":    now_iso if p["status"] == "up" else None,
             "isUnused":    False,
             "unusedSince": None,
-            "events":      [{"timestamp": int(time.time() * 1000), "event": p["status"]}],
+            "events":      [{"timestamp": now_ms, "event": p["status"]}],
         }
         ports.append(port)
-    return ports
+        if p["status"] == "up":
+            up_count += 1
+    return ports, up_count
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# POLLING  ─ SSH poll of one switch, results written to the cache
+# ═══════════════════════════════════════════════════════════════════════════════
+
+POLL_COMMANDS = [
+    "show interfaces status",
+    "show interfaces",
+    "show power inline",
+    "show version",
+]
+
+# Parsing is pure-Python CPU work; running it in worker processes keeps it off
+# the GIL that the SSH threads share. Parsers must stay picklable top-level
+# functions for this. The pool is created at startup and uses forkserver, so
+# workers are never forked from a process whose SSH threads may hold locks.
+_PARSE_POOL = None
+_parse_pool_lock = threading.Lock()
+
+def new_parse_pool():
+    """New parser pool — forkserver where available (not on Windows), spawn
+    otherwise. Returns None if no pool can be created; parsing then runs inline."""
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    try:
+        return ProcessPoolExecutor(
+            max_workers=os.cpu_count(),
+            mp_context=multiprocessing.get_context(method),
+        )
+    except (ValueError, OSError, NotImplementedError) as e:
+        print(f"⚠  parse pool unavailable, parsing inline: {e}")
+        return None
+
+def assemble_in_pool(outputs: dict) -> tuple[list[dict], int]:
+    """assemble_ports() in _PARSE_POOL; inline if there is no pool or it broke."""
+    global _PARSE_POOL
+    pool = _PARSE_POOL
+    if pool is None:
+        return assemble_ports(outputs)
+    try:
+        return pool.submit(assemble_ports, outputs).result()
+    except BrokenProcessPool:
+        # A worker died — replace the pool for later polls, parse this one inline
+        print("⚠  parse pool broken — restarting it")
+        with _parse_pool_lock:
+            if _PARSE_POOL is pool:
+                _PARSE_POOL = new_parse_pool()
+        pool.shutdown(wait=False)
+        return assemble_ports(outputs)
+
+def poll_switch(host: str) -> dict:
+    """Poll a switch over SSH and cache the assembled port payload."""
+    outputs  = run_show_multi(host, POLL_COMMANDS)
+    ports, up_count = assemble_in_pool(outputs)
+    sysinfo  = {
+        "uptime":   parse_uptime(outputs.get("show version", "")),
+        "hostname": parse_hostname(outputs.get("show version", "")),
+    }
+
+    payload = {
+        "ports":     ports,
+        "sysinfo":   sysinfo,
+        "cachedAt":  datetime.utcnow().isoformat(),
+    }
+    cache_set(f"ports:{host}", payload)
+    cache_set(f"status:{host}", {
+        "reachable":  True,
+        "lastPolled": datetime.utcnow().isoformat(),
+        "portCount":  len(ports),
+        "portsUp":    up_count,
+    })
+    return payload
+
+# ── Single-flight: concurrent polls of one host share a single SSH session ───
+_inflight: dict = {}
+_inflight_lock = threading.Lock()
+
+def poll_shared(host: str) -> dict:
+    """
+    poll_switch(), except that callers arriving while a poll of the same host
+    is running wait for its result instead of starting their own.
+    """
+    with _inflight_lock:
+        fut = _inflight.get(host)
+        leader = fut is None
+        if leader:
+            fut = _inflight[host] = Future()
+
+    if not leader:
+        return fut.result()
+
+    try:
+        payload = poll_switch(host)
+        fut.set_result(payload)
+    except Exception as e:
+        fut.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(host, None)
+    return payload
+
+def poll_error(host: str, e: Exception) -> tuple[int, str]:
+    """Map a poll failure to (HTTP status, message)."""
+    if isinstance(e, NetmikoAuthenticationException):
+        return 401, "SSH authentication failed — check credentials"
+    if isinstance(e, NetmikoTimeoutException):
+        return 504, f"Timeout connecting to {host}"
+    return 502, f"SSH error: {str(e)}"
+
+def record_poll_failure(host: str, e: Exception) -> tuple[int, str]:
+    """Store a failed poll in host's status entry; returns (HTTP status, message)."""
+    code, message = poll_error(host, e)
+    cache_set(f"status:{host}", {
+        "reachable":  False,
+        "lastPolled": datetime.utcnow().isoformat(),
+        "error":      message,
+        "errorCode":  code,
+    })
+    return code, message
+
+def poll_one(host: str):
+    """Poll host, recording a failure in its status entry instead of raising."""
+    try:
+        poll_shared(host)
+    except Exception as e:
+        record_poll_failure(host, e)
+
+def cache_last(key: str):
+    """Last value stored under key, however old (the poller keeps it fresh)."""
+    entry = _cache.peek(key)
+    return entry[0] if entry else None
+
+def cached_ports(host: str):
+    """Port payload from the last successful poll of host, or None."""
+    cached = cache_last(f"ports:{host}")
+    if cached:
+        return {"source": "cache", "cachedAt": cached["cachedAt"], "ports": cached["ports"], "sysinfo": cached.get("sysinfo", {})}
+    return None
+
+def switch_status_fields(sw: dict) -> dict:
+    """Inventory entry plus reachability/port counts from its last poll."""
+    status = cache_last(f"status:{sw['host']}")
+    return {
+        **sw,
+        "reachable":  status.get("reachable") if status else None,
+        "lastPolled": status.get("lastPolled") if status else None,
+        "portCount":  status.get("portCount") if status else None,
+        "portsUp":    status.get("portsUp") if status else None,
+    }
+
+# ── Background poller: every switch is re-polled every CACHE_TTL seconds ──────
+# HTTP GETs are served from the cache it fills, so request latency no longer
+# depends on switch latency and SSH load is O(switches), not O(requests).
+_poller_task = None
+
+async def poller(skip_first: set):
+    """Poll forever. Hosts in skip_first already have fresh data restored
+    from disk and sit out the first round."""
+    skip          = skip_first
+    last_snapshot = time.monotonic()
+    while True:
+        started = time.monotonic()
+        # A bad round (e.g. a broken switches.json) must not kill the task —
+        # log it and try again next round
+        try:
+            hosts = [sw["host"] for sw in load_switches() if sw["host"] not in skip]
+            skip  = set()
+            await asyncio.gather(*[in_ssh_pool(poll_one, h) for h in hosts], return_exceptions=True)
+            if time.monotonic() - last_snapshot >= CACHE_SNAPSHOT_EVERY:
+                last_snapshot = time.monotonic()
+                await asyncio.to_thread(save_cache_snapshot)
+        except Exception as e:
+            print(f"⚠  poll round failed: {e!r}")
+        await asyncio.sleep(max(0.0, CACHE_TTL - (time.monotonic() - started)))
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # API ROUTES
@@ -333,16 +697,26 @@ def assemble_ports(outputs: dict) -> list[dict]:
 def list_switches():
     """Return the switch inventory list."""
     switches = load_switches()
-    # Add reachability status from cache if available
+    # Add reachability status from the last poll if available
+    return [switch_status_fields(sw) for sw in switches]
+
+
+@app.get("/api/switches/summary")
+def switches_summary():
+    """
+    Inventory, reachability and a thin per-port view (id/status/speed) for
+    every switch in one response — saves the dashboard one ports request per switch.
+    """
     result = []
-    for sw in switches:
-        cached = cache_get(f"status:{sw['host']}")
+    for sw in load_switches():
+        cached = cache_last(f"ports:{sw['host']}")
         result.append({
-            **sw,
-            "reachable": cached.get("reachable") if cached else None,
-            "lastPolled": cached.get("lastPolled") if cached else None,
-            "portCount":  cached.get("portCount") if cached else None,
-            "portsUp":    cached.get("portsUp") if cached else None,
+            **switch_status_fields(sw),
+            "cachedAt":   cached["cachedAt"] if cached else None,
+            "ports": [
+                {"id": p["id"], "status": p["status"], "speed": p["speed"]}
+                for p in cached["ports"]
+            ] if cached else [],
         })
     return result
 
@@ -350,94 +724,94 @@ def list_switches():
 @app.get("/api/switches/{host}/ports")
 def get_switch_ports(host: str):
     """
-    Pull live port data from a switch via SSH.
-    Results are cached for CACHE_TTL seconds.
+    Port data for a switch from the last background poll.
+    The poller refreshes it every CACHE_TTL seconds.
     """
-    # Check cache first
-    cached = cache_get(f"ports:{host}")
-    if cached:
-        return {"source": "cache", "cachedAt": cached["cachedAt"], "ports": cached["ports"], "sysinfo": cached.get("sysinfo", {})}
-
     if not NETMIKO_AVAILABLE:
         raise HTTPException(503, "netmiko not installed — run: pip install netmiko")
 
-    # Verify host is in our inventory (security: don't allow arbitrary hosts)
-    switches = load_switches()
-    if not any(sw["host"] == host for sw in switches):
-        raise HTTPException(404, f"Switch {host} not in inventory")
+    require_known_host(host)
 
-    try:
-        outputs = run_show_multi(host, [
-            "show interfaces status",
-            "show interfaces",
-            "show power inline",
-            "show version",
-        ])
-    except NetmikoAuthenticationException:
-        raise HTTPException(401, "SSH authentication failed — check credentials")
-    except NetmikoTimeoutException:
-        raise HTTPException(504, f"Timeout connecting to {host}")
-    except Exception as e:
-        raise HTTPException(502, f"SSH error: {str(e)}")
+    # A failed latest poll wins over older port data, so the UI sees the error
+    status = cache_last(f"status:{host}")
+    if status and not status.get("reachable"):
+        raise HTTPException(status["errorCode"], status["error"])
+    cached = cached_ports(host)
+    if cached:
+        return cached
+    raise HTTPException(503, f"Switch {host} not polled yet — retry shortly")
 
-    ports    = assemble_ports(outputs)
-    sysinfo  = {
-        "uptime":   parse_uptime(outputs.get("show version", "")),
-        "hostname": parse_hostname(outputs.get("show version", "")),
-    }
 
-    payload = {
-        "ports":     ports,
-        "sysinfo":   sysinfo,
-        "cachedAt":  datetime.utcnow().isoformat(),
-    }
-    cache_set(f"ports:{host}", payload)
-    cache_set(f"status:{host}", {
-        "reachable":  True,
-        "lastPolled": datetime.utcnow().isoformat(),
-        "portCount":  len(ports),
-        "portsUp":    sum(1 for p in ports if p["status"] == "up"),
-    })
+@app.get("/api/switches/ports")
+def get_all_switch_ports():
+    """
+    Port data for every switch in the inventory from the last background poll.
+    Switches whose latest poll failed, or without data yet, are reported per host.
+    """
+    if not NETMIKO_AVAILABLE:
+        raise HTTPException(503, "netmiko not installed — run: pip install netmiko")
 
-    return {"source": "live", **payload}
+    result = {}
+    for sw in load_switches():
+        h = sw["host"]
+        status = cache_last(f"status:{h}")
+        if status and not status.get("reachable"):
+            result[h] = {"error": status["error"]}
+        else:
+            result[h] = cached_ports(h) or {"error": "not polled yet"}
+    return result
 
 
 @app.get("/api/switches/{host}/ports/{port_id}/mac")
-def get_port_mac(host: str, port_id: str):
+async def get_port_mac(host: str, port_id: str):
     """Fetch MAC address table for a single port on demand."""
-    switches = load_switches()
-    if not any(sw["host"] == host for sw in switches):
-        raise HTTPException(404, f"Switch {host} not in inventory")
+    require_known_host(host)
 
     if not NETMIKO_AVAILABLE:
         return {"macTable": []}
 
     try:
-        raw = run_show(host, f"show mac address-table interface {port_id}")
+        raw = await in_ssh_pool(run_show, host, f"show mac address-table interface {port_id}")
         return {"macTable": parse_mac_table(raw, port_id)}
     except Exception as e:
         raise HTTPException(502, f"SSH error: {str(e)}")
 
 
 @app.post("/api/switches/{host}/refresh")
-def force_refresh(host: str):
-    """Invalidate cache and force a fresh SSH poll."""
-    _cache.pop(f"ports:{host}", None)
-    _cache.pop(f"status:{host}", None)
-    return {"message": f"Cache cleared for {host} — next request will poll live"}
+async def force_refresh(host: str):
+    """Re-poll a switch immediately instead of waiting for the poller."""
+    require_known_host(host)
+    if not NETMIKO_AVAILABLE:
+        raise HTTPException(503, "netmiko not installed — run: pip install netmiko")
+
+    try:
+        await in_ssh_pool(poll_shared, host)
+    except Exception as e:
+        # Record it so the next GET of /ports reports the error, not stale data
+        code, message = record_poll_failure(host, e)
+        raise HTTPException(code, message)
+    return {"message": f"Re-polled {host}"}
+
+
+@app.post("/api/switches/refresh-all")
+async def refresh_all():
+    """Re-poll every switch in parallel immediately."""
+    if not NETMIKO_AVAILABLE:
+        raise HTTPException(503, "netmiko not installed — run: pip install netmiko")
+
+    hosts = [sw["host"] for sw in load_switches()]
+    await asyncio.gather(*[in_ssh_pool(poll_one, h) for h in hosts], return_exceptions=True)
+    return {h: cache_last(f"status:{h}") for h in hosts}
 
 
 @app.get("/api/switches/{host}/ping")
-def ping_switch(host: str):
+async def ping_switch(host: str):
     """Quick reachability check — just open SSH and close."""
-    switches = load_switches()
-    if not any(sw["host"] == host for sw in switches):
-        raise HTTPException(404, f"Switch {host} not in inventory")
+    require_known_host(host)
     if not NETMIKO_AVAILABLE:
         return {"reachable": False, "reason": "netmiko not installed"}
     try:
-        with ssh_connect(host) as conn:
-            hostname = conn.find_prompt().replace("#", "").replace(">", "").strip()
+        hostname = await in_ssh_pool(find_hostname, host)
         return {"reachable": True, "hostname": hostname}
     except NetmikoAuthenticationException:
         return {"reachable": False, "reason": "auth_failed"}
@@ -456,10 +830,50 @@ def get_inventory():
 @app.post("/api/switches/list/inventory")
 def update_inventory(switches: list):
     """Update the switches.json inventory."""
-    SWITCHES_FILE.write_text(json.dumps(switches, indent=2))
+    write_atomic(SWITCHES_FILE, json.dumps(switches, indent=2).encode())
+    _inv_cache["mtime"] = 0.0   # force a reload even within the same mtime tick
     return {"message": f"Saved {len(switches)} switches"}
 
 
+@app.on_event("startup")
+def start_parse_pool():
+    """Create the parser process pool (not in DEMO mode — nothing is parsed)."""
+    global _PARSE_POOL
+    if NETMIKO_AVAILABLE:
+        _PARSE_POOL = new_parse_pool()
+
+
+@app.on_event("startup")
+async def start_poller():
+    """Restore the cache snapshot and start the background poller
+    (not in DEMO mode — there is nothing to poll)."""
+    global _poller_task
+    restored = load_cache_snapshot()
+    if NETMIKO_AVAILABLE:
+        _poller_task = asyncio.create_task(poller(restored))
+
+
+@app.on_event("shutdown")
+def save_cache():
+    """Snapshot the cache to disk so the next start can skip a full re-poll."""
+    try:
+        save_cache_snapshot()
+    except OSError as e:
+        print(f"⚠  cache snapshot failed: {e}")
+
+
+@app.on_event("shutdown")
+def close_connections():
+    """Stop the poller, disconnect every persistent SSH session and stop the worker pools."""
+    if _poller_task is not None:
+        _poller_task.cancel()
+    for host in list(_conn_cache):
+        drop_conn(host)
+    _SSH_POOL.shutdown(wait=False)
+    if _PARSE_POOL is not None:
+        _PARSE_POOL.shutdown(wait=False)
+
+
 @app.get("/health")
 def health():
     return {"status": "ok", "netmiko": NETMIKO_AVAILABLE, "cachedHosts": len(_cache)}